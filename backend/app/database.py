@@ -1,17 +1,41 @@
 from sqlmodel import create_engine, SQLModel, Session
+from sqlalchemy.pool import NullPool
 import os
 from dotenv import load_dotenv
+from .models.models import GraphVersion
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pathfinder.db")
 
-engine = create_engine(DATABASE_URL, echo=True)
+# SQLite sin pool: los endpoints async usan sesiones síncronas en el event loop y,
+# con el QueuePool por defecto (5 + 10 conexiones), esperar una conexión libre
+# bloqueaba el loop hasta el timeout de 30 s con más de 15 peticiones en curso
+engine_options = {"poolclass": NullPool} if DATABASE_URL.startswith("sqlite") else {}
+
+engine = create_engine(DATABASE_URL, echo=True, **engine_options)
 
 
 def create_db_and_tables():
     """Crear base de datos y tablas"""
     SQLModel.metadata.create_all(engine)
+    
+    # WAL: las lecturas largas (p. ej. GET /graph/export, que lee todo el grafo en
+    # una transacción) no bloquean a los escritores. El modo queda guardado en el archivo
+    if DATABASE_URL.startswith("sqlite"):
+        with engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+    
+    # create_all no agrega índices nuevos a tablas ya existentes
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    
+    # Fila única con la versión del grafo (ver services.algorithms.get_graph)
+    with Session(engine) as session:
+        if session.get(GraphVersion, 1) is None:
+            session.add(GraphVersion(id=1, version=0))
+            session.commit()
 
 
 def get_session():
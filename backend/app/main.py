@@ -1,13 +1,44 @@
-from fastapi import FastAPI
+import os
+import threading
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from .database import create_db_and_tables
 from .routers import auth, graph
+from .services.algorithms import warm_up_graph
+
+# Precargar el grafo en memoria en segundo plano al iniciar
+WARM_UP_GRAPH = os.getenv("WARM_UP_GRAPH", "false").lower() in ("1", "true", "yes")
+
+
+def _warm_up(app: FastAPI):
+    """Precargar el grafo y marcar la aplicación como lista"""
+    try:
+        warm_up_graph()
+    finally:
+        # Un fallo en la precarga no bloquea el servicio: el grafo se
+        # construirá en la primera consulta
+        app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ciclo de vida de la aplicación"""
+    create_db_and_tables()
+    
+    app.state.ready = not WARM_UP_GRAPH
+    if WARM_UP_GRAPH:
+        threading.Thread(target=_warm_up, args=(app,), daemon=True).start()
+    
+    yield
+
 
 # Crear aplicación FastAPI
 app = FastAPI(
     title="PathFinder API",
     description="API para explorar rutas en grafos con autenticación JWT",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -24,12 +55,6 @@ app.include_router(auth.router)
 app.include_router(graph.router)
 
 
-@app.on_event("startup")
-def on_startup():
-    """Eventos de inicio de la aplicación"""
-    create_db_and_tables()
-
-
 @app.get("/")
 def read_root():
     """Endpoint raíz"""
@@ -43,4 +68,13 @@ def read_root():
 @app.get("/health")
 def health_check():
     """Endpoint de verificación de salud"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/ready")
+def readiness_check(response: Response):
+    """Endpoint de disponibilidad: 503 hasta que termine la precarga del grafo"""
+    if not getattr(app.state, "ready", False):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+    return {"status": "ready"}
\ No newline at end of file
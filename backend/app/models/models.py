@@ -18,11 +18,17 @@ class Node(SQLModel, table=True):
 class Edge(SQLModel, table=True):
     """Modelo para aristas del grafo"""
     id: Optional[int] = Field(default=None, primary_key=True)
-    src_id: int = Field(foreign_key="node.id")
-    dst_id: int = Field(foreign_key="node.id")
+    src_id: int = Field(foreign_key="node.id", index=True)
+    dst_id: int = Field(foreign_key="node.id", index=True)
     weight: float = Field(gt=0)  # weight > 0
 
 
+class GraphVersion(SQLModel, table=True):
+    """Versión del grafo: se incrementa en cada transacción que modifica aristas"""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    version: int = 0
+
+
 # Schemas para requests y responses
 class UserCreate(SQLModel):
     username: str
@@ -43,6 +49,10 @@ class NodeCreate(SQLModel):
     name: str
 
 
+class NodeBulkDelete(SQLModel):
+    node_ids: list[int]
+
+
 class EdgeCreate(SQLModel):
     src_id: int
     dst_id: int
@@ -59,4 +69,37 @@ class DijkstraResponse(SQLModel):
     path: list[int]
     distance: float
     start_node: int
-    end_node: int
\ No newline at end of file
+    end_node: int
+
+
+class BFSTreeRequest(SQLModel):
+    source_ids: list[int]
+    max_depth: Optional[int] = Field(default=None, ge=0)
+
+
+class ShortestPathTreeRequest(SQLModel):
+    source_ids: list[int]
+    max_distance: Optional[float] = Field(default=None, ge=0)
+
+
+class BFSTreeResponse(SQLModel):
+    sources: list[int]
+    max_depth: int
+    nodes: list[int]
+    depth: list[int]
+    parent: list[int]
+    source: list[int]
+
+
+class ShortestPathTreeResponse(SQLModel):
+    sources: list[int]
+    max_distance: float
+    nodes: list[int]
+    distance: list[float]
+    parent: list[int]
+    source: list[int]
+
+
+class SnapshotImportResponse(SQLModel):
+    nodes: int
+    edges: int
\ No newline at end of file
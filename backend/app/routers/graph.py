@@ -1,14 +1,45 @@
+import math
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select
-from ..database import get_session
-from ..models.models import Node, Edge, NodeCreate, EdgeCreate, BFSResponse, DijkstraResponse, User
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, delete
+from ..database import engine, get_session
+from ..models.models import (
+    Node, Edge, NodeCreate, NodeBulkDelete, EdgeCreate, BFSResponse, DijkstraResponse, User,
+    BFSTreeRequest, BFSTreeResponse, ShortestPathTreeRequest, ShortestPathTreeResponse,
+    SnapshotImportResponse
+)
 from ..routers.auth import get_current_user
-from ..services.algorithms import bfs_algorithm, dijkstra_algorithm
+from ..services.algorithms import (
+    bfs_algorithm, dijkstra_algorithm, multi_source_bfs, shortest_path_tree,
+    bump_graph_version, invalidate_graph_cache, find_missing_nodes, QUERY_BATCH_SIZE
+)
+from ..services.serialization import (
+    INT32_MEDIA_TYPE, bfs_response, dijkstra_response, bfs_tree_response, shortest_path_tree_response
+)
+from ..services.snapshot import (
+    DEFAULT_CHUNK_SIZE, MAX_BLOCK_ROWS, SNAPSHOT_MEDIA_TYPE, SnapshotLoader, iter_snapshot
+)
 
 router = APIRouter(prefix="/graph", tags=["Graph"], dependencies=[Depends(get_current_user)])
 
 
+def _delete_nodes_with_edges(session: Session, node_ids: List[int]) -> None:
+    """Eliminar nodos y sus aristas incidentes con sentencias DELETE por lotes (sin commit)"""
+    # El DELETE de aristas usa el lote dos veces (src_id y dst_id): lotes de la mitad
+    edge_batch_size = QUERY_BATCH_SIZE // 2
+    for start in range(0, len(node_ids), edge_batch_size):
+        batch = node_ids[start:start + edge_batch_size]
+        session.execute(
+            delete(Edge).where(Edge.src_id.in_(batch) | Edge.dst_id.in_(batch))
+        )
+    for start in range(0, len(node_ids), QUERY_BATCH_SIZE):
+        batch = node_ids[start:start + QUERY_BATCH_SIZE]
+        session.execute(delete(Node).where(Node.id.in_(batch)))
+
+
 # Endpoints para Nodos
 @router.post("/nodes", response_model=Node, status_code=status.HTTP_201_CREATED)
 async def create_node(
@@ -63,18 +94,36 @@ async def delete_node(
             detail=f"Node with id {node_id} not found"
         )
     
-    # Eliminar todas las aristas que involucran este nodo
-    edges_statement = select(Edge).where(
-        (Edge.src_id == node_id) | (Edge.dst_id == node_id)
-    )
-    edges = session.exec(edges_statement).all()
+    # Eliminar el nodo y todas las aristas que lo involucran
+    _delete_nodes_with_edges(session, [node_id])
+    bump_graph_version(session)
+    session.commit()
+    invalidate_graph_cache()
+
+
+@router.post("/nodes/bulk-delete", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_nodes(
+    data: NodeBulkDelete,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Eliminar varios nodos y todas sus aristas incidentes en una sola transacción"""
+    node_ids = list(dict.fromkeys(data.node_ids))
+    if not node_ids:
+        return
     
-    for edge in edges:
-        session.delete(edge)
+    # Verificar que todos los nodos existen
+    missing_ids = find_missing_nodes(session, node_ids)
+    if missing_ids:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Nodes with ids {missing_ids} not found"
+        )
     
-    # Eliminar el nodo
-    session.delete(node)
+    _delete_nodes_with_edges(session, node_ids)
+    bump_graph_version(session)
     session.commit()
+    invalidate_graph_cache()
 
 
 # Endpoints para Aristas
@@ -112,7 +161,9 @@ async def create_edge(
     )
     
     session.add(db_edge)
+    bump_graph_version(session)
     session.commit()
+    invalidate_graph_cache()
     session.refresh(db_edge)
     
     return db_edge
@@ -146,12 +197,71 @@ async def delete_edge(
         )
     
     session.delete(edge)
+    bump_graph_version(session)
     session.commit()
+    invalidate_graph_cache()
+
+
+# Endpoints para Snapshots del grafo
+def _snapshot_stream(chunk_size: int):
+    """Generar el snapshot con una sesión propia que vive lo mismo que la respuesta"""
+    with Session(engine) as session:
+        yield from iter_snapshot(session, chunk_size)
+
+
+@router.get("/export", response_class=StreamingResponse, responses={200: {"content": {SNAPSHOT_MEDIA_TYPE: {}}}})
+def export_graph(
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=MAX_BLOCK_ROWS, description="Filas por bloque"),
+    current_user: User = Depends(get_current_user)
+):
+    """Exportar todos los nodos y aristas como snapshot binario comprimido"""
+    return StreamingResponse(
+        _snapshot_stream(chunk_size),
+        media_type=SNAPSHOT_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="graph.pfsnap"'}
+    )
+
+
+@router.post("/import", response_model=SnapshotImportResponse)
+async def import_graph(
+    request: Request,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Reemplazar el grafo completo por el contenido de un snapshot"""
+    # Las inserciones masivas se ejecutan en el threadpool para no bloquear el
+    # event loop (y con él /health, /ready y el resto de peticiones)
+    try:
+        loader = await run_in_threadpool(SnapshotLoader, session)
+        async for data in request.stream():
+            await run_in_threadpool(loader.feed, data)
+        result = await run_in_threadpool(loader.finish)
+    except ValueError as e:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid snapshot: duplicated node ids or names"
+        )
+    
+    invalidate_graph_cache()
+    return SnapshotImportResponse(**result)
 
 
 # Endpoints para Algoritmos
-@router.get("/bfs", response_model=BFSResponse)
+# Las respuestas se serializan directamente (sin revalidar con response_model);
+# con "Accept: application/x-pathfinder-int32" se devuelven en binario
+INT32_RESPONSE = {200: {"content": {INT32_MEDIA_TYPE: {}}}}
+
+
+@router.get("/bfs", response_model=BFSResponse, responses=INT32_RESPONSE)
 async def bfs_search(
+    request: Request,
     start_id: int = Query(..., description="ID del nodo de inicio"),
     max_depth: int = Query(None, description="Profundidad máxima de búsqueda"),
     session: Session = Depends(get_session),
@@ -160,7 +270,7 @@ async def bfs_search(
     """Ejecutar búsqueda BFS desde un nodo de inicio"""
     try:
         result = bfs_algorithm(session, start_id, max_depth)
-        return BFSResponse(**result)
+        return bfs_response(request, result)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -168,8 +278,9 @@ async def bfs_search(
         )
 
 
-@router.get("/shortest-path", response_model=DijkstraResponse)
+@router.get("/shortest-path", response_model=DijkstraResponse, responses=INT32_RESPONSE)
 async def shortest_path(
+    request: Request,
     src_id: int = Query(..., description="ID del nodo origen"),
     dst_id: int = Query(..., description="ID del nodo destino"),
     session: Session = Depends(get_session),
@@ -178,7 +289,7 @@ async def shortest_path(
     """Encontrar el camino más corto entre dos nodos usando Dijkstra"""
     try:
         result = dijkstra_algorithm(session, src_id, dst_id)
-        return DijkstraResponse(**result)
+        return dijkstra_response(request, result)
     except ValueError as e:
         error_msg = str(e)
         if "not found" in error_msg.lower():
@@ -195,4 +306,82 @@ async def shortest_path(
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=error_msg
-            )
\ No newline at end of file
+            )
+
+
+# Endpoints de Análisis (árboles desde uno o varios orígenes)
+def _bfs_tree(request: Request, session: Session, source_ids: List[int], max_depth: int):
+    """Ejecutar multi_source_bfs (compartido por GET y POST /bfs-tree)"""
+    try:
+        result = multi_source_bfs(session, source_ids, max_depth)
+        return bfs_tree_response(request, result)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
+@router.get("/bfs-tree", response_model=BFSTreeResponse, responses=INT32_RESPONSE)
+async def bfs_tree(
+    request: Request,
+    source_ids: List[int] = Query(..., description="IDs de los nodos origen (repetible)"),
+    max_depth: int = Query(None, ge=0, description="Profundidad máxima desde el origen más cercano"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """BFS multi-origen: profundidad, padre y origen más cercano de cada nodo alcanzado"""
+    return _bfs_tree(request, session, source_ids, max_depth)
+
+
+@router.post("/bfs-tree", response_model=BFSTreeResponse, responses=INT32_RESPONSE)
+async def bfs_tree_body(
+    request: Request,
+    data: BFSTreeRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Igual que GET /bfs-tree, con los orígenes en el cuerpo JSON (para miles de orígenes)"""
+    return _bfs_tree(request, session, data.source_ids, data.max_depth)
+
+
+def _shortest_path_tree(request: Request, session: Session, source_ids: List[int], max_distance: float):
+    """Ejecutar shortest_path_tree (compartido por GET y POST /shortest-path-tree)"""
+    # ge=0 deja pasar "inf" (y JSON admite Infinity), que no se puede representar en la respuesta
+    if max_distance is not None and not math.isfinite(max_distance):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="max_distance must be a finite number"
+        )
+    
+    try:
+        result = shortest_path_tree(session, source_ids, max_distance)
+        return shortest_path_tree_response(request, result)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
+@router.get("/shortest-path-tree", response_model=ShortestPathTreeResponse, responses=INT32_RESPONSE)
+async def shortest_path_tree_search(
+    request: Request,
+    source_ids: List[int] = Query(..., description="IDs de los nodos origen (repetible)"),
+    max_distance: float = Query(None, ge=0, description="Distancia máxima desde el origen más cercano"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Dijkstra multi-origen: distancia, padre y origen más cercano de cada nodo alcanzado"""
+    return _shortest_path_tree(request, session, source_ids, max_distance)
+
+
+@router.post("/shortest-path-tree", response_model=ShortestPathTreeResponse, responses=INT32_RESPONSE)
+async def shortest_path_tree_body(
+    request: Request,
+    data: ShortestPathTreeRequest,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Igual que GET /shortest-path-tree, con los orígenes en el cuerpo JSON"""
+    return _shortest_path_tree(request, session, data.source_ids, data.max_distance)
@@ -1,24 +1,101 @@
 from collections import deque, defaultdict
 import heapq
+import threading
 from typing import Dict, List, Optional, Tuple
-from sqlmodel import Session, select
-from ..models.models import Node, Edge
+from sqlmodel import Session, select, update
+from ..database import engine
+from ..models.models import Node, Edge, GraphVersion
 
+Graph = Dict[int, List[Tuple[int, float]]]
 
-def build_graph(session: Session) -> Dict[int, List[Tuple[int, float]]]:
+# Máximo de parámetros por sentencia (límite de SQLite antiguos: 999). Una
+# sentencia con varias listas IN debe repartir el lote entre ellas
+QUERY_BATCH_SIZE = 500
+
+# Caché en memoria de la lista de adyacencia (una por proceso), etiquetada con
+# la versión de GraphVersion con la que se construyó para detectar escrituras de
+# otros procesos. _graph_generation se incrementa en cada invalidación local para
+# descartar construcciones que empezaron antes de una escritura.
+_graph_lock = threading.Lock()
+_graph_cache: Optional[Graph] = None
+_graph_version: Optional[int] = None
+_graph_generation = 0
+
+
+def build_graph(session: Session) -> Graph:
     """Construir grafo como lista de adyacencia desde la base de datos"""
     graph = defaultdict(list)
     
-    # Obtener todas las aristas
-    statement = select(Edge)
-    edges = session.exec(statement).all()
+    # Leer solo las columnas necesarias, sin materializar objetos Edge
+    statement = select(Edge.src_id, Edge.dst_id, Edge.weight)
     
-    for edge in edges:
-        graph[edge.src_id].append((edge.dst_id, edge.weight))
+    for src_id, dst_id, weight in session.exec(statement):
+        graph[src_id].append((dst_id, weight))
     
     return dict(graph)
 
 
+def _read_graph_version(session: Session) -> Optional[int]:
+    """Leer la versión actual del grafo (consulta por clave primaria)"""
+    statement = select(GraphVersion.version).where(GraphVersion.id == 1)
+    return session.exec(statement).first()
+
+
+def bump_graph_version(session: Session) -> None:
+    """
+    Incrementar la versión del grafo dentro de la transacción actual.
+    Debe llamarse antes del commit en toda escritura que modifique aristas.
+    """
+    session.execute(
+        update(GraphVersion)
+        .where(GraphVersion.id == 1)
+        .values(version=GraphVersion.version + 1)
+    )
+
+
+def get_graph(session: Session) -> Graph:
+    """
+    Obtener la lista de adyacencia desde la caché en memoria,
+    reconstruyéndola si la versión del grafo cambió. El resultado es compartido:
+    no debe modificarse.
+    """
+    global _graph_cache, _graph_version
+    
+    # La versión se lee antes que las aristas: el grafo construido es al menos
+    # tan reciente como la versión con la que se etiqueta
+    version = _read_graph_version(session)
+    with _graph_lock:
+        if _graph_cache is not None and version is not None and _graph_version == version:
+            return _graph_cache
+        generation = _graph_generation
+    
+    graph = build_graph(session)
+    
+    with _graph_lock:
+        # Solo publicar si nadie invalidó la caché mientras se construía
+        if generation == _graph_generation and version is not None:
+            _graph_cache = graph
+            _graph_version = version
+    
+    return graph
+
+
+def invalidate_graph_cache() -> None:
+    """Descartar la lista de adyacencia en memoria tras modificar el grafo"""
+    global _graph_cache, _graph_version, _graph_generation
+    
+    with _graph_lock:
+        _graph_cache = None
+        _graph_version = None
+        _graph_generation += 1
+
+
+def warm_up_graph() -> None:
+    """Cargar la lista de adyacencia en memoria antes de recibir tráfico"""
+    with Session(engine) as session:
+        get_graph(session)
+
+
 def bfs_algorithm(session: Session, start_id: int, max_depth: int = None) -> dict:
     """
     Algoritmo BFS que retorna el orden de visita y los nodos visitados
@@ -29,7 +106,7 @@ def bfs_algorithm(session: Session, start_id: int, max_depth: int = None) -> dic
     if not start_node:
         raise ValueError(f"Node with id {start_id} not found")
     
-    graph = build_graph(session)
+    graph = get_graph(session)
     
     # Inicializar estructuras
     visited = set()
@@ -78,7 +155,7 @@ def dijkstra_algorithm(session: Session, src_id: int, dst_id: int) -> dict:
     if not dst_node:
         raise ValueError(f"Destination node with id {dst_id} not found")
     
-    graph = build_graph(session)
+    graph = get_graph(session)
     
     # Inicializar distancias y predecesores
     distances = {src_id: 0}
@@ -107,7 +184,7 @@ def dijkstra_algorithm(session: Session, src_id: int, dst_id: int) -> dict:
             
             return {
                 "path": path,
-                "distance": distances[dst_id],
+                "distance": float(distances[dst_id]),
                 "start_node": src_id,
                 "end_node": dst_id
             }
@@ -127,6 +204,119 @@ def dijkstra_algorithm(session: Session, src_id: int, dst_id: int) -> dict:
     raise ValueError(f"No existe una arista o camino entre los nodos {src_id} y {dst_id}. Verifica que ambos nodos estén conectados en el grafo.")
 
 
+def find_missing_nodes(session: Session, node_ids: List[int]) -> List[int]:
+    """Devolver, en el orden recibido, los IDs que no existen en la tabla de nodos"""
+    existing_ids = set()
+    for start in range(0, len(node_ids), QUERY_BATCH_SIZE):
+        batch = node_ids[start:start + QUERY_BATCH_SIZE]
+        existing_ids.update(session.exec(select(Node.id).where(Node.id.in_(batch))).all())
+    return [node_id for node_id in node_ids if node_id not in existing_ids]
+
+
+def _check_sources(session: Session, source_ids: List[int]) -> List[int]:
+    """Verificar que los nodos origen existen; devuelve los IDs sin duplicados"""
+    source_ids = list(dict.fromkeys(source_ids))
+    if not source_ids:
+        raise ValueError("At least one source node is required")
+    
+    missing_ids = find_missing_nodes(session, source_ids)
+    if missing_ids:
+        raise ValueError(f"Node with id {missing_ids[0]} not found")
+    return source_ids
+
+
+def multi_source_bfs(session: Session, source_ids: List[int], max_depth: int = None) -> dict:
+    """
+    BFS desde varios orígenes a la vez. Para cada nodo alcanzado devuelve su
+    profundidad, su padre en el árbol (-1 en los orígenes) y el origen más cercano,
+    como arreglos paralelos en orden de visita
+    """
+    source_ids = _check_sources(session, source_ids)
+    graph = get_graph(session)
+    
+    depth = {source_id: 0 for source_id in source_ids}
+    parent = {source_id: -1 for source_id in source_ids}
+    nearest = {source_id: source_id for source_id in source_ids}
+    order = list(source_ids)
+    
+    # `order` hace de cola: los nodos se visitan en el orden en que se descubren
+    index = 0
+    while index < len(order):
+        current_id = order[index]
+        index += 1
+        
+        next_depth = depth[current_id] + 1
+        if max_depth is not None and next_depth > max_depth:
+            continue
+        
+        for neighbor_id, _ in graph.get(current_id, ()):
+            if neighbor_id not in depth:
+                depth[neighbor_id] = next_depth
+                parent[neighbor_id] = current_id
+                nearest[neighbor_id] = nearest[current_id]
+                order.append(neighbor_id)
+    
+    return {
+        "sources": source_ids,
+        "max_depth": max_depth if max_depth is not None else -1,
+        "nodes": order,
+        "depth": [depth[node_id] for node_id in order],
+        "parent": [parent[node_id] for node_id in order],
+        "source": [nearest[node_id] for node_id in order]
+    }
+
+
+def shortest_path_tree(session: Session, source_ids: List[int], max_distance: float = None) -> dict:
+    """
+    Dijkstra multi-origen: árbol de caminos mínimos desde uno o varios orígenes.
+    Para cada nodo alcanzado (distancia <= max_distance) devuelve la distancia,
+    el padre (-1 en los orígenes) y el origen más cercano, en orden de distancia
+    """
+    source_ids = _check_sources(session, source_ids)
+    graph = get_graph(session)
+    
+    distances = {source_id: 0.0 for source_id in source_ids}
+    parent = {source_id: -1 for source_id in source_ids}
+    nearest = {source_id: source_id for source_id in source_ids}
+    visited = set()
+    order = []
+    
+    pq = [(0.0, source_id) for source_id in source_ids]
+    heapq.heapify(pq)
+    
+    while pq:
+        current_dist, current_id = heapq.heappop(pq)
+        
+        if current_id in visited:
+            continue
+        
+        visited.add(current_id)
+        order.append(current_id)
+        
+        for neighbor_id, weight in graph.get(current_id, ()):
+            if neighbor_id in visited:
+                continue
+            
+            new_dist = current_dist + weight
+            if max_distance is not None and new_dist > max_distance:
+                continue
+            
+            if neighbor_id not in distances or new_dist < distances[neighbor_id]:
+                distances[neighbor_id] = new_dist
+                parent[neighbor_id] = current_id
+                nearest[neighbor_id] = nearest[current_id]
+                heapq.heappush(pq, (new_dist, neighbor_id))
+    
+    return {
+        "sources": source_ids,
+        "max_distance": float(max_distance) if max_distance is not None else -1.0,
+        "nodes": order,
+        "distance": [distances[node_id] for node_id in order],
+        "parent": [parent[node_id] for node_id in order],
+        "source": [nearest[node_id] for node_id in order]
+    }
+
+
 def get_all_nodes(session: Session) -> List[Node]:
     """Obtener todos los nodos"""
     statement = select(Node)
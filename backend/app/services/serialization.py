@@ -0,0 +1,133 @@
+import json
+import struct
+import sys
+from array import array
+from typing import Callable, Iterable
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: se usa json de la librería estándar
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+# Enteros int32 little-endian empaquetados, precedidos por una cabecera fija
+INT32_MEDIA_TYPE = "application/x-pathfinder-int32"
+
+# BFS: start_node, max_depth, len(visited_nodes) + visited_nodes
+BFS_HEADER = struct.Struct("<iiI")
+# Dijkstra: start_node, end_node, distance, len(path) + path
+DIJKSTRA_HEADER = struct.Struct("<iidI")
+# Árbol BFS: max_depth, len(sources), len(nodes)
+# + sources, nodes, depth, parent, source (int32)
+BFS_TREE_HEADER = struct.Struct("<iII")
+# Árbol de caminos mínimos: max_distance, len(sources), len(nodes)
+# + sources, nodes (int32), distance (float64), parent, source (int32)
+SHORTEST_PATH_TREE_HEADER = struct.Struct("<dII")
+
+
+def dumps_json(data) -> bytes:
+    """Serializar a JSON con orjson si está disponible"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def accepts_int32(request: Request) -> bool:
+    """Comprobar si el cliente pidió la codificación binaria en el header Accept"""
+    accept = request.headers.get("accept", "")
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        if media_type.strip().lower() != INT32_MEDIA_TYPE:
+            continue
+        
+        # q=0 significa que el cliente rechaza explícitamente este tipo
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            return True
+    return False
+
+
+def pack_array(typecode: str, values: Iterable) -> bytes:
+    """Empaquetar valores como array little-endian (códigos de tipo de `array`)"""
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def pack_int32(values: Iterable[int]) -> bytes:
+    """Empaquetar enteros como int32 little-endian"""
+    return pack_array("i", values)
+
+
+def pack_float64(values: Iterable[float]) -> bytes:
+    """Empaquetar reales como float64 little-endian"""
+    return pack_array("d", values)
+
+
+def _encoded_response(request: Request, data: dict, build_body: Callable[[], bytes]) -> Response:
+    """Responder en binario si se negoció y los IDs caben en int32, o en JSON"""
+    if accepts_int32(request):
+        try:
+            body = build_body()
+        except (OverflowError, struct.error):
+            body = None
+        if body is not None:
+            return Response(body, media_type=INT32_MEDIA_TYPE, headers={"Vary": "Accept"})
+
+    return Response(dumps_json(data), media_type=JSON_MEDIA_TYPE, headers={"Vary": "Accept"})
+
+
+def bfs_response(request: Request, result: dict) -> Response:
+    """
+    Respuesta de BFS ya validada: el resultado lo genera bfs_algorithm, así que
+    se serializa directamente sin construir ni revalidar BFSResponse
+    """
+    visited_nodes = result["visited_nodes"]
+    return _encoded_response(request, result, lambda: (
+        BFS_HEADER.pack(result["start_node"], result["max_depth"], len(visited_nodes))
+        + pack_int32(visited_nodes)
+    ))
+
+
+def dijkstra_response(request: Request, result: dict) -> Response:
+    """Respuesta de Dijkstra ya validada (ver bfs_response)"""
+    path = result["path"]
+    return _encoded_response(request, result, lambda: (
+        DIJKSTRA_HEADER.pack(result["start_node"], result["end_node"], result["distance"], len(path))
+        + pack_int32(path)
+    ))
+
+
+def bfs_tree_response(request: Request, result: dict) -> Response:
+    """Respuesta de multi_source_bfs ya validada (ver bfs_response)"""
+    return _encoded_response(request, result, lambda: b"".join([
+        BFS_TREE_HEADER.pack(result["max_depth"], len(result["sources"]), len(result["nodes"])),
+        pack_int32(result["sources"]),
+        pack_int32(result["nodes"]),
+        pack_int32(result["depth"]),
+        pack_int32(result["parent"]),
+        pack_int32(result["source"]),
+    ]))
+
+
+def shortest_path_tree_response(request: Request, result: dict) -> Response:
+    """Respuesta de shortest_path_tree ya validada (ver bfs_response)"""
+    return _encoded_response(request, result, lambda: b"".join([
+        SHORTEST_PATH_TREE_HEADER.pack(
+            result["max_distance"], len(result["sources"]), len(result["nodes"])
+        ),
+        pack_int32(result["sources"]),
+        pack_int32(result["nodes"]),
+        pack_float64(result["distance"]),
+        pack_int32(result["parent"]),
+        pack_int32(result["source"]),
+    ]))
@@ -0,0 +1,288 @@
+"""
+Snapshots binarios del grafo completo (nodos y aristas).
+
+Formato: flujo gzip que contiene una cabecera MAGIC seguida de bloques
+columnares little-endian. Cada bloque empieza con `<cI` (tipo, filas):
+
+- b"N": id int64[n], longitud del nombre uint32[n], nombres UTF-8 concatenados
+- b"E": id int64[n], src_id int64[n], dst_id int64[n], weight float64[n]
+- b"Z": fin del snapshot (n = 0)
+
+Exportación e importación procesan un bloque cada vez, por lo que la memoria
+usada depende de `chunk_size` y no del tamaño del grafo. La exportación parte
+los bloques de nodos para no superar MAX_BLOCK_BYTES; al importar, los bloques
+de más de MAX_BLOCK_ROWS filas o MAX_BLOCK_BYTES bytes se rechazan, igual que
+las aristas cuyos extremos no están en el snapshot.
+"""
+
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterator, Optional
+from sqlmodel import Session, select, delete, insert
+from ..models.models import Node, Edge
+from .algorithms import bump_graph_version
+from .serialization import pack_array
+
+MAGIC = b"PFSNAP\x01\x00"
+BLOCK_HEADER = struct.Struct("<cI")
+NODES_BLOCK = b"N"
+EDGES_BLOCK = b"E"
+END_BLOCK = b"Z"
+
+DEFAULT_CHUNK_SIZE = 50_000
+MAX_BLOCK_ROWS = 1_000_000
+# Un bloque de MAX_BLOCK_ROWS aristas ocupa 32 MB
+MAX_BLOCK_BYTES = 64 * 1024 * 1024
+# Salida máxima por llamada a decompress(): acota la memoria ante entradas muy comprimibles
+DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+SNAPSHOT_MEDIA_TYPE = "application/x-pathfinder-snapshot"
+
+# wbits=31: formato gzip, legible también con `gunzip`
+GZIP_WBITS = 31
+# Nivel 1: comprimir es el cuello de botella al exportar; niveles altos
+# apenas reducen el tamaño de columnas numéricas
+COMPRESSION_LEVEL = 1
+
+
+def _unpack(typecode: str, data: bytes) -> array:
+    """Leer una columna little-endian"""
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _nodes_block(ids: list, names: list) -> bytes:
+    """Codificar un bloque de nodos (id, name con los nombres ya en UTF-8)"""
+    return b"".join([
+        BLOCK_HEADER.pack(NODES_BLOCK, len(ids)),
+        pack_array("q", ids),
+        pack_array("I", (len(name) for name in names)),
+        b"".join(names),
+    ])
+
+
+def _nodes_blocks(rows) -> Iterator[bytes]:
+    """
+    Codificar una página de nodos en uno o más bloques: con nombres largos, una
+    página de `chunk_size` filas puede superar MAX_BLOCK_BYTES
+    """
+    ids, names = [], []
+    size = BLOCK_HEADER.size
+    for node_id, name in rows:
+        encoded = name.encode("utf-8")
+        row_size = 12 + len(encoded)
+        if ids and size + row_size > MAX_BLOCK_BYTES:
+            yield _nodes_block(ids, names)
+            ids, names = [], []
+            size = BLOCK_HEADER.size
+        ids.append(node_id)
+        names.append(encoded)
+        size += row_size
+    if ids:
+        yield _nodes_block(ids, names)
+
+
+def _edges_block(rows) -> bytes:
+    """Codificar un bloque de aristas (id, src_id, dst_id, weight)"""
+    return b"".join([
+        BLOCK_HEADER.pack(EDGES_BLOCK, len(rows)),
+        pack_array("q", (row[0] for row in rows)),
+        pack_array("q", (row[1] for row in rows)),
+        pack_array("q", (row[2] for row in rows)),
+        pack_array("d", (row[3] for row in rows)),
+    ])
+
+
+def _iter_rows(session: Session, columns, id_column, chunk_size: int):
+    """Recorrer una tabla por páginas de `chunk_size` filas ordenadas por id"""
+    # La primera página no tiene cota inferior: también se exportan IDs <= 0
+    last_id = None
+    while True:
+        statement = select(*columns).order_by(id_column).limit(chunk_size)
+        if last_id is not None:
+            statement = statement.where(id_column > last_id)
+        rows = session.exec(statement).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def _begin_read_transaction(session: Session) -> None:
+    """Abrir una transacción de lectura para que todas las páginas vean el mismo estado"""
+    if session.get_bind().dialect.name == "sqlite":
+        # pysqlite no abre transacción para SELECT: BEGIN explícito. La sesión
+        # la termina con ROLLBACK al cerrarse
+        session.connection().exec_driver_sql("BEGIN")
+    else:
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+
+def iter_snapshot(session: Session, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Generar el snapshot comprimido del grafo en fragmentos. Toda la lectura
+    ocurre en una sola transacción, así que el snapshot es consistente aunque
+    haya escrituras concurrentes
+    """
+    if not 1 <= chunk_size <= MAX_BLOCK_ROWS:
+        raise ValueError(f"chunk_size must be between 1 and {MAX_BLOCK_ROWS}")
+    
+    _begin_read_transaction(session)
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, wbits=GZIP_WBITS)
+
+    yield compressor.compress(MAGIC)
+    for rows in _iter_rows(session, (Node.id, Node.name), Node.id, chunk_size):
+        for block in _nodes_blocks(rows):
+            yield compressor.compress(block)
+    for rows in _iter_rows(
+        session, (Edge.id, Edge.src_id, Edge.dst_id, Edge.weight), Edge.id, chunk_size
+    ):
+        yield compressor.compress(_edges_block(rows))
+    yield compressor.compress(BLOCK_HEADER.pack(END_BLOCK, 0))
+    yield compressor.flush()
+
+
+class SnapshotLoader:
+    """
+    Restaurar un snapshot reemplazando los nodos y aristas existentes.
+    Los datos se entregan por fragmentos con `feed()` y se confirman con
+    `finish()`; ante cualquier error se lanza ValueError y el llamador debe
+    hacer rollback.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+        self.buffer = bytearray()
+        self.header_read = False
+        self.finished = False
+        self.nodes_loaded = 0
+        self.edges_loaded = 0
+
+        session.execute(delete(Edge))
+        session.execute(delete(Node))
+
+    def feed(self, data: bytes) -> None:
+        """Descomprimir un fragmento e insertar los bloques completos"""
+        while data:
+            try:
+                self.buffer += self.decompressor.decompress(data, DECOMPRESS_CHUNK_SIZE)
+            except zlib.error as e:
+                raise ValueError(f"Invalid snapshot: {e}")
+            self._consume()
+            # Tras el bloque de fin no se acumula nada: cualquier dato extra es un error
+            if (self.finished and self.buffer) or self.decompressor.unused_data:
+                raise ValueError("Invalid snapshot: trailing data")
+            data = self.decompressor.unconsumed_tail
+
+    def finish(self) -> dict:
+        """Verificar que el snapshot está completo y confirmar la transacción"""
+        try:
+            self.buffer += self.decompressor.flush()
+        except zlib.error as e:
+            raise ValueError(f"Invalid snapshot: {e}")
+        self._consume()
+
+        # flush() no falla si el flujo está incompleto: sin `eof` no se llegó a
+        # verificar el CRC32 ni la longitud del trailer gzip
+        if not self.finished or not self.decompressor.eof:
+            raise ValueError("Invalid snapshot: truncated")
+        if self.buffer or self.decompressor.unused_data:
+            raise ValueError("Invalid snapshot: trailing data")
+        self._check_edge_endpoints()
+
+        bump_graph_version(self.session)
+        self.session.commit()
+        return {"nodes": self.nodes_loaded, "edges": self.edges_loaded}
+
+    def _check_edge_endpoints(self) -> None:
+        """Rechazar aristas cuyo origen o destino no es un nodo del snapshot"""
+        node_ids = select(Node.id)
+        statement = (
+            select(Edge.id)
+            .where(Edge.src_id.not_in(node_ids) | Edge.dst_id.not_in(node_ids))
+            .limit(1)
+        )
+        edge_id = self.session.exec(statement).first()
+        if edge_id is not None:
+            raise ValueError(f"Invalid snapshot: edge {edge_id} references a missing node")
+
+    def _consume(self) -> None:
+        """Procesar todos los bloques completos disponibles en el buffer"""
+        if not self.header_read:
+            if len(self.buffer) < len(MAGIC):
+                return
+            if bytes(self.buffer[:len(MAGIC)]) != MAGIC:
+                raise ValueError("Invalid snapshot: unknown format or version")
+            del self.buffer[:len(MAGIC)]
+            self.header_read = True
+
+        while not self.finished:
+            consumed = self._read_block()
+            if consumed is None:
+                return
+            del self.buffer[:consumed]
+
+    def _read_block(self) -> Optional[int]:
+        """Insertar el siguiente bloque; devuelve los bytes consumidos o None si falta"""
+        if len(self.buffer) < BLOCK_HEADER.size:
+            return None
+        kind, count = BLOCK_HEADER.unpack_from(self.buffer)
+        offset = BLOCK_HEADER.size
+        if count > MAX_BLOCK_ROWS:
+            raise ValueError(f"Invalid snapshot: block of {count} rows exceeds {MAX_BLOCK_ROWS}")
+        view = memoryview(self.buffer)
+
+        try:
+            if kind == END_BLOCK:
+                self.finished = True
+                return offset
+
+            if kind == NODES_BLOCK:
+                columns_end = offset + 12 * count
+                if len(self.buffer) < columns_end:
+                    return None
+                ids = _unpack("q", view[offset:offset + 8 * count])
+                lengths = _unpack("I", view[offset + 8 * count:columns_end])
+                block_end = columns_end + sum(lengths)
+                if block_end > MAX_BLOCK_BYTES:
+                    raise ValueError(f"Invalid snapshot: block exceeds {MAX_BLOCK_BYTES} bytes")
+                if len(self.buffer) < block_end:
+                    return None
+
+                rows = []
+                position = columns_end
+                for node_id, length in zip(ids, lengths):
+                    name = bytes(view[position:position + length]).decode("utf-8")
+                    rows.append({"id": node_id, "name": name})
+                    position += length
+                self.session.execute(insert(Node), rows)
+                self.nodes_loaded += count
+                return block_end
+
+            if kind == EDGES_BLOCK:
+                block_end = offset + 32 * count
+                if len(self.buffer) < block_end:
+                    return None
+                ids = _unpack("q", view[offset:offset + 8 * count])
+                src_ids = _unpack("q", view[offset + 8 * count:offset + 16 * count])
+                dst_ids = _unpack("q", view[offset + 16 * count:offset + 24 * count])
+                weights = _unpack("d", view[offset + 24 * count:block_end])
+
+                rows = [
+                    {"id": edge_id, "src_id": src_id, "dst_id": dst_id, "weight": weight}
+                    for edge_id, src_id, dst_id, weight in zip(ids, src_ids, dst_ids, weights)
+                ]
+                self.session.execute(insert(Edge), rows)
+                self.edges_loaded += count
+                return block_end
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Invalid snapshot: {e}")
+        finally:
+            view.release()
+
+        raise ValueError(f"Invalid snapshot: unknown block type {kind!r}")
@@ -13,6 +13,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from app.database import create_db_and_tables, get_session
 from app.models.models import Node, Edge
+from app.services.algorithms import bump_graph_version
 from sqlmodel import select
 
 
@@ -106,6 +107,8 @@ def load_edges_from_csv(session, csv_file_path: str):
             edges_loaded += 1
             print(f"  + Arista {src_name} -> {dst_name} (peso: {weight}) creada")
     
+    if edges_loaded:
+        bump_graph_version(session)
     session.commit()
     return edges_loaded, edges_skipped, edges_error
 
@@ -0,0 +1,372 @@
+"""
+Script de prueba de carga para la API.
+
+Para cada tamaño de grafo indicado:
+1. Crea una base de datos SQLite temporal con un grafo sintético reproducible.
+2. Arranca un worker de uvicorn con `app.main:app` sobre esa base de datos.
+3. Genera tráfico mixto de lectura/escritura con un cliente HTTP asíncrono.
+4. Mide latencias (p50/p90/p99) y throughput por operación.
+
+El reporte se imprime como JSON en stdout (o en --output). Con --slo, el
+script termina con código 1 si algún objetivo no se cumple.
+
+Uso:
+    python scripts/load_test.py --sizes 1000:5000,10000:50000 --duration 20
+    python scripts/load_test.py --slo scripts/load_slo.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar módulos de la app
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from sqlmodel import SQLModel, create_engine, insert
+from app.models.models import Node, Edge
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+USERNAME = "loadtest"
+PASSWORD = "loadtest-password"
+
+DEFAULT_MIX = "shortest_path=40,bfs=30,me=15,create_edge=10,login=5"
+
+# Métricas de summarize() que admiten un máximo en el archivo SLO, más min_rps
+# (mínimo de throughput); rps, requests y errors no son límites superiores
+SLO_METRICS = {"error_rate", "p50_ms", "p90_ms", "p99_ms", "max_ms", "min_rps"}
+
+# Respuestas esperadas por operación: un 404 de shortest-path significa
+# "no hay camino", que es un resultado válido en un grafo aleatorio
+EXPECTED_STATUS = {
+    "shortest_path": {200, 404},
+    "bfs": {200},
+    "me": {200},
+    "login": {200},
+    "create_edge": {201},
+}
+
+
+def log(message: str):
+    """Mensajes de progreso por stderr para no mezclar con el reporte JSON"""
+    print(message, file=sys.stderr, flush=True)
+
+
+def parse_sizes(value: str):
+    """Interpretar '1000:5000,10000:50000' como [(nodos, aristas), ...]"""
+    sizes = []
+    for item in value.split(","):
+        nodes, edges = item.split(":")
+        sizes.append((int(nodes), int(edges)))
+    return sizes
+
+
+def parse_mix(value: str) -> dict:
+    """Interpretar 'shortest_path=40,bfs=30' como pesos por operación"""
+    mix = {}
+    for item in value.split(","):
+        name, weight = item.split("=")
+        if name not in EXPECTED_STATUS:
+            raise argparse.ArgumentTypeError(f"Operación desconocida: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def seed_database(db_path: str, num_nodes: int, num_edges: int, seed: int):
+    """Crear la base de datos con un grafo aleatorio reproducible"""
+    rng = random.Random(seed)
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Node), [{"id": i, "name": f"node-{i}"} for i in range(1, num_nodes + 1)]
+        )
+        connection.execute(insert(Edge), [
+            {
+                "src_id": rng.randint(1, num_nodes),
+                "dst_id": rng.randint(1, num_nodes),
+                "weight": round(rng.uniform(1, 100), 2),
+            }
+            for _ in range(num_edges)
+        ])
+    engine.dispose()
+
+
+def free_port() -> int:
+    """Obtener un puerto TCP libre"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: str, port: int, stderr) -> subprocess.Popen:
+    """Arrancar un worker de uvicorn contra la base de datos sembrada"""
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{db_path}"
+    env["WARM_UP_GRAPH"] = "true"
+    # stderr va a un archivo (no a un pipe) para que el servidor nunca se
+    # bloquee escribiendo logs que nadie lee durante la prueba
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=stderr
+    )
+
+
+async def wait_until_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 60.0):
+    """Esperar a que /ready responda 200 (grafo precargado)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"El servidor terminó al arrancar (código {server.returncode})")
+        try:
+            response = await client.get("/ready")
+            if response.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("El servidor no estuvo listo a tiempo")
+
+
+async def authenticate(client: httpx.AsyncClient) -> dict:
+    """Registrar el usuario de prueba y devolver el header de autorización"""
+    credentials = {"username": USERNAME, "password": PASSWORD}
+    await client.post("/auth/register", json=credentials)
+    response = await client.post("/auth/login", json=credentials)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def build_request(operation: str, rng: random.Random, num_nodes: int, max_depth: int):
+    """Construir (método, url, kwargs) para una operación"""
+    if operation == "shortest_path":
+        src_id, dst_id = rng.randint(1, num_nodes), rng.randint(1, num_nodes)
+        return "GET", f"/graph/shortest-path?src_id={src_id}&dst_id={dst_id}", {}
+    if operation == "bfs":
+        start_id = rng.randint(1, num_nodes)
+        return "GET", f"/graph/bfs?start_id={start_id}&max_depth={max_depth}", {}
+    if operation == "me":
+        return "GET", "/auth/me", {}
+    if operation == "login":
+        return "POST", "/auth/login", {"json": {"username": USERNAME, "password": PASSWORD}}
+    edge = {
+        "src_id": rng.randint(1, num_nodes),
+        "dst_id": rng.randint(1, num_nodes),
+        "weight": round(rng.uniform(1, 100), 2),
+    }
+    return "POST", "/graph/edges", {"json": edge}
+
+
+async def worker(client, headers, mix, num_nodes, max_depth, seed, deadline, samples, errors):
+    """Enviar peticiones secuenciales hasta el fin de la prueba"""
+    rng = random.Random(seed)
+    operations, weights = list(mix), list(mix.values())
+
+    while time.monotonic() < deadline:
+        operation = rng.choices(operations, weights)[0]
+        method, url, kwargs = build_request(operation, rng, num_nodes, max_depth)
+
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, headers=headers, **kwargs)
+            ok = response.status_code in EXPECTED_STATUS[operation]
+        except httpx.HTTPError:
+            ok = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if ok:
+            samples[operation].append(elapsed_ms)
+        else:
+            errors[operation] += 1
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Percentil por rango más cercano sobre valores ordenados"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list, error_count: int, duration: float) -> dict:
+    """Resumen de latencias y throughput de una operación"""
+    values = sorted(latencies)
+    total = len(values) + error_count
+    return {
+        "requests": total,
+        "errors": error_count,
+        "error_rate": error_count / total if total else 0.0,
+        "rps": len(values) / duration,
+        "p50_ms": percentile(values, 0.50),
+        "p90_ms": percentile(values, 0.90),
+        "p99_ms": percentile(values, 0.99),
+        "max_ms": values[-1] if values else 0.0,
+    }
+
+
+async def run_load(server: subprocess.Popen, port: int, num_nodes: int, args) -> dict:
+    """Ejecutar la fase de calentamiento y la de medición contra un servidor"""
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30.0
+    ) as client:
+        await wait_until_ready(client, server)
+        headers = await authenticate(client)
+
+        results = {}
+        for phase, duration in (("warmup", args.warmup), ("measure", args.duration)):
+            if duration <= 0:
+                continue
+            samples = {operation: [] for operation in args.mix}
+            errors = {operation: 0 for operation in args.mix}
+            deadline = time.monotonic() + duration
+            started = time.monotonic()
+            await asyncio.gather(*[
+                worker(client, headers, args.mix, num_nodes, args.max_depth,
+                       args.seed + i, deadline, samples, errors)
+                for i in range(args.concurrency)
+            ])
+            results[phase] = (samples, errors, time.monotonic() - started)
+
+    samples, errors, elapsed = results["measure"]
+    report = {
+        operation: summarize(samples[operation], errors[operation], elapsed)
+        for operation in args.mix
+    }
+    report["total"] = summarize(
+        [value for values in samples.values() for value in values],
+        sum(errors.values()), elapsed
+    )
+    return report
+
+
+def run_size(num_nodes: int, num_edges: int, args) -> dict:
+    """Sembrar, arrancar el servidor y medir para un tamaño de grafo"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "loadtest.db")
+        log(f"→ Sembrando grafo: {num_nodes} nodos, {num_edges} aristas...")
+        seed_database(db_path, num_nodes, num_edges, args.seed)
+
+        port = free_port()
+        with open(Path(tmp_dir) / "server.log", "w+") as server_log:
+            server = start_server(db_path, port, server_log)
+            try:
+                log(f"→ Midiendo {args.duration:.0f} s con {args.concurrency} clientes...")
+                report = asyncio.run(run_load(server, port, num_nodes, args))
+            except Exception:
+                server_log.seek(0)
+                log("❌ Salida de error del servidor:\n" + server_log.read())
+                raise
+            finally:
+                server.terminate()
+                server.wait(timeout=10)
+
+    return {"nodes": num_nodes, "edges": num_edges, "operations": report}
+
+
+def validate_slo(slo: dict, mix: dict) -> None:
+    """Rechazar operaciones o métricas desconocidas antes de lanzar la carga"""
+    for operation, targets in slo.items():
+        if operation != "total" and operation not in EXPECTED_STATUS:
+            raise ValueError(f"Operación desconocida en el SLO: {operation}")
+        if operation != "total" and operation not in mix:
+            log(f"⚠ SLO de {operation} ignorado: la operación no está en --mix")
+        unknown = set(targets) - SLO_METRICS
+        if unknown:
+            raise ValueError(
+                f"Métricas no admitidas en el SLO de {operation}: {', '.join(sorted(unknown))} "
+                f"(válidas: {', '.join(sorted(SLO_METRICS))})"
+            )
+
+
+def check_slo(results: list, slo: dict) -> list:
+    """
+    Comparar los resultados con los objetivos. Formato del archivo SLO:
+    {"<operación o total>": {"p50_ms": máx, "p99_ms": máx, "error_rate": máx, "min_rps": mín}}
+    """
+    violations = []
+    for result in results:
+        size = f"{result['nodes']}:{result['edges']}"
+        for operation, targets in slo.items():
+            stats = result["operations"].get(operation)
+            if stats is None:
+                continue
+            for metric, limit in targets.items():
+                if metric == "min_rps":
+                    if stats["rps"] < limit:
+                        violations.append(f"[{size}] {operation}: rps {stats['rps']:.1f} < {limit}")
+                elif stats[metric] > limit:
+                    violations.append(f"[{size}] {operation}: {metric} {stats[metric]:.2f} > {limit}")
+    return violations
+
+
+def main():
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de PathFinder")
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("1000:5000,10000:50000"),
+                        help="Tamaños de grafo como nodos:aristas separados por comas")
+    parser.add_argument("--duration", type=float, default=15.0, help="Segundos de medición por tamaño")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Segundos de calentamiento por tamaño")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clientes concurrentes")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help="Pesos por operación, p.ej. " + DEFAULT_MIX)
+    parser.add_argument("--max-depth", type=int, default=3, help="max_depth de las consultas BFS")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla para grafo y tráfico")
+    parser.add_argument("--slo", type=Path, help="Archivo JSON con los objetivos a verificar")
+    parser.add_argument("--output", type=Path, help="Escribir el reporte JSON en este archivo")
+    args = parser.parse_args()
+    if args.duration <= 0:
+        parser.error("--duration debe ser mayor que 0")
+
+    slo = None
+    if args.slo:
+        slo = json.loads(args.slo.read_text())
+        try:
+            validate_slo(slo, args.mix)
+        except ValueError as e:
+            parser.error(str(e))
+
+    log("=== PathFinder - Prueba de Carga ===")
+    results = [run_size(num_nodes, num_edges, args) for num_nodes, num_edges in args.sizes]
+
+    report = json.dumps({
+        "config": {
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "max_depth": args.max_depth,
+            "seed": args.seed,
+        },
+        "results": results,
+    }, indent=2)
+
+    if args.output:
+        args.output.write_text(report)
+        log(f"✓ Reporte escrito en {args.output}")
+    else:
+        print(report)
+
+    if slo is not None:
+        violations = check_slo(results, slo)
+        if violations:
+            for violation in violations:
+                log(f"❌ SLO: {violation}")
+            sys.exit(1)
+        log("✅ Todos los SLO se cumplen")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Script para exportar e importar el grafo completo como snapshot binario.
+El formato es el mismo que usan GET /graph/export y POST /graph/import.
+
+Uso:
+    python scripts/snapshot.py export graph.pfsnap
+    python scripts/snapshot.py import graph.pfsnap
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar módulos de la app
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy.exc import IntegrityError
+from app.database import create_db_and_tables, get_session
+from app.services.snapshot import DEFAULT_CHUNK_SIZE, MAX_BLOCK_ROWS, SnapshotLoader, iter_snapshot
+
+READ_SIZE = 1024 * 1024
+
+
+def export_snapshot(session, path: Path, chunk_size: int) -> int:
+    """Escribir el snapshot en un archivo y devolver los bytes escritos"""
+    written = 0
+    with open(path, "wb") as file:
+        for data in iter_snapshot(session, chunk_size):
+            file.write(data)
+            written += len(data)
+    return written
+
+
+def import_snapshot(session, path: Path) -> dict:
+    """Reemplazar el grafo con el contenido del archivo"""
+    loader = SnapshotLoader(session)
+    with open(path, "rb") as file:
+        while data := file.read(READ_SIZE):
+            loader.feed(data)
+    return loader.finish()
+
+
+def main():
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Exportar/importar snapshots del grafo")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("path", type=Path, help="Archivo del snapshot")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Filas por bloque al exportar")
+    args = parser.parse_args()
+    if not 1 <= args.chunk_size <= MAX_BLOCK_ROWS:
+        parser.error(f"--chunk-size debe estar entre 1 y {MAX_BLOCK_ROWS}")
+
+    print("=== PathFinder - Snapshot del Grafo ===\n")
+    create_db_and_tables()
+
+    session_generator = get_session()
+    session = next(session_generator)
+    start = time.perf_counter()
+
+    try:
+        if args.command == "export":
+            written = export_snapshot(session, args.path, args.chunk_size)
+            print(f"✓ Snapshot exportado a {args.path} ({written} bytes)")
+        else:
+            if not args.path.exists():
+                print(f"❌ Error: No se encontró el archivo {args.path}")
+                sys.exit(1)
+            result = import_snapshot(session, args.path)
+            print(f"✓ Snapshot importado: {result['nodes']} nodos, {result['edges']} aristas")
+    except (ValueError, IntegrityError) as e:
+        session.rollback()
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        session.close()
+
+    print(f"✅ Completado en {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
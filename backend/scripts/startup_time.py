@@ -0,0 +1,137 @@
+"""
+Script para medir el tiempo de arranque del backend.
+Muestra el desglose de tiempos de importación y falla (código de salida 1)
+si el arranque supera el presupuesto o si vuelven a importarse al inicio
+los módulos que deben cargarse de forma diferida.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Módulos que solo deben importarse en el primer uso (login / verificación de token)
+DEFERRED_MODULES = ["jose", "passlib", "bcrypt"]
+
+# Importa la app y ejecuta el lifespan completo, como haría un worker al iniciar
+STARTUP_PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def run_lifespan():
+    async with app.router.lifespan_context(app):
+        pass
+
+asyncio.run(run_lifespan())
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (done - start) * 1000,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+""" % (DEFERRED_MODULES,)
+
+
+def probe_env(db_path: str) -> dict:
+    """Entorno del subproceso con una base de datos temporal"""
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{db_path}"
+    env["WARM_UP_GRAPH"] = "false"
+    return env
+
+
+def import_breakdown(env: dict, top: int):
+    """Desglose de `python -X importtime` por módulo importado directamente"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    # Formato: "import time: self | acumulado | <sangría>módulo", en postorden
+    # (cada módulo aparece después de todo lo que importa)
+    lines = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        lines.append((level, name.strip(), int(cumulative_us) / 1000))
+
+    # Recorrer hacia atrás el subárbol de app.main y quedarse con sus hijos directos
+    root = max(i for i, (level, name, _) in enumerate(lines) if level == 0 and name == "app.main")
+    entries = []
+    for level, name, cumulative_ms in reversed(lines[:root]):
+        if level == 0:
+            break
+        if level == 1:
+            entries.append((name, cumulative_ms))
+
+    entries.sort(key=lambda entry: entry[1], reverse=True)
+    return entries[:top]
+
+
+def measure_startup(env: dict, runs: int):
+    """Ejecutar el arranque completo varias veces en procesos nuevos"""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    """Función principal del script"""
+    parser = argparse.ArgumentParser(description="Medir el tiempo de arranque del backend")
+    parser.add_argument("--runs", type=int, default=5, help="Número de arranques a medir")
+    # ~450 ms medidos con las dependencias de requirements.txt, más ~50 % de margen
+    # para la variación entre máquinas
+    parser.add_argument("--budget-ms", type=float, default=700.0,
+                        help="Presupuesto para la mediana del arranque completo")
+    parser.add_argument("--top", type=int, default=10, help="Módulos a mostrar en el desglose")
+    args = parser.parse_args()
+
+    print("=== PathFinder - Tiempo de Arranque ===\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = probe_env(str(Path(tmp_dir) / "startup.db"))
+
+        print("1. Desglose de importación (acumulado, ms)...")
+        for name, cumulative_ms in import_breakdown(env, args.top):
+            print(f"   {cumulative_ms:8.1f}  {name}")
+        print()
+
+        print(f"2. Midiendo {args.runs} arranques...")
+        samples = measure_startup(env, args.runs)
+
+    import_ms = statistics.median(sample["import_ms"] for sample in samples)
+    startup_ms = statistics.median(sample["startup_ms"] for sample in samples)
+    loaded = sorted({name for sample in samples for name in sample["loaded"]})
+    print(f"   ✓ Importación: {import_ms:.1f} ms (mediana)")
+    print(f"   ✓ Arranque completo: {startup_ms:.1f} ms (mediana)\n")
+
+    failed = False
+    if loaded:
+        print(f"❌ Módulos diferidos importados al arrancar: {', '.join(loaded)}")
+        failed = True
+    if startup_ms > args.budget_ms:
+        print(f"❌ El arranque ({startup_ms:.1f} ms) supera el presupuesto de {args.budget_ms:.0f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("✅ Arranque dentro del presupuesto")
+
+
+if __name__ == "__main__":
+    main()